@@ -1,8 +1,42 @@
+import altair as alt
+import numpy as np
 import pandas as pd
 import streamlit as st
 
 import superannuation as sp
 
+# --- Cached Calculations ---
+# Streamlit reruns this whole script on every widget interaction, so memoize the
+# calculations on their (hashable) inputs.
+
+@st.cache_data
+def calculate_super_growth_trajectory(current_balance, annual_contribution, annual_return_rate, years):
+    return sp.calculate_super_growth_trajectory(current_balance, annual_contribution, annual_return_rate, years)
+
+@st.cache_data
+def years_to_reach_target_super(start_age, current_balance, target_balance, annual_contribution, annual_return_rate):
+    return sp.years_to_reach_target_super(start_age, current_balance, target_balance, annual_contribution, annual_return_rate)
+
+@st.cache_data
+def project_retirement_income(start_super, start_age, end_age, super_return_rate, target_after_tax_income, relationship_status):
+    return sp.project_retirement_income(start_super, start_age, end_age, super_return_rate, target_after_tax_income, relationship_status)
+
+@st.cache_data
+def project_grid(start_super, start_age, end_age, super_return_rates, target_after_tax_incomes, relationship_status):
+    return sp.project_grid(start_super, start_age, end_age, super_return_rates, target_after_tax_incomes, relationship_status)
+
+def last_result(key, inputs):
+    """
+    Returns the result stored under `key` in the session state if it was computed
+    from `inputs`, so it stays on screen across unrelated reruns without being
+    recomputed. A result for other inputs is stale and is cleared.
+    """
+    stored = st.session_state.get(key)
+    if stored is not None and stored[0] == inputs:
+        return stored[1]
+    st.session_state.pop(key, None)
+    return None
+
 # --- Streamlit App ---
 
 st.set_page_config(layout="wide", page_title="Australian Retirement Planner")
@@ -29,7 +63,7 @@ st.sidebar.markdown("""
 """)
 
 # Main content area with tabs
-tab1, tab2, tab3 = st.tabs(["🚀 Super Growth Calculator", "🎯 Years to Reach Target Super", "📈 Retirement Income Projection"])
+tab1, tab2, tab3, tab4 = st.tabs(["🚀 Super Growth Calculator", "🎯 Years to Reach Target Super", "📈 Retirement Income Projection", "📊 Sensitivity"])
 
 with tab1:
     st.header("Super Growth Calculator")
@@ -43,9 +77,15 @@ with tab1:
         sg_annual_return = st.slider("Annual Super Return Rate (%)", min_value=1.0, max_value=20.0, value=5.0, step=0.1) / 100
         sg_years = st.slider("Number of Years to Project", min_value=1, max_value=50, value=10, step=1)
 
+    sg_inputs = (sg_current_balance, sg_annual_contribution, sg_annual_return, sg_years)
     if st.button("Calculate Super Growth"):
-        final_balance = sp.calculate_super_growth(sg_current_balance, sg_annual_contribution, sg_annual_return, sg_years)
+        st.session_state.sg_result = (sg_inputs, calculate_super_growth_trajectory(*sg_inputs))
+
+    trajectory = last_result("sg_result", sg_inputs)
+    if trajectory is not None:
+        final_balance = trajectory[-1]
         st.success(f"After {sg_years} years, your super balance will be approximately **${final_balance:,.2f}**")
+        st.line_chart(trajectory, x_label="Year", y_label="Super Balance ($)")
 
 with tab2:
     st.header("Years to Reach Target Super")
@@ -61,9 +101,14 @@ with tab2:
         tr_annual_return = st.slider("Annual Super Return Rate (%) ", min_value=1.0, max_value=20.0, value=5.0, step=0.1) / 100
         
 
+    tr_inputs = (tr_start_age, tr_current_balance, tr_target_balance, tr_annual_contribution, tr_annual_return)
     if st.button("Calculate Years to Target"):
-        years, age, final_bal = sp.years_to_reach_target_super(tr_start_age, tr_current_balance, tr_target_balance, tr_annual_contribution, tr_annual_return)
-        
+        st.session_state.tr_result = (tr_inputs, years_to_reach_target_super(*tr_inputs))
+
+    target_result = last_result("tr_result", tr_inputs)
+    if target_result is not None:
+        years, age, final_bal = target_result
+
         if years == float('inf'):
             st.warning(f"Based on your inputs, it might not be possible to reach ${tr_target_balance:,.2f} within a reasonable timeframe (100 years). Current balance reached: ${final_bal:,.2f}")
         else:
@@ -94,50 +139,96 @@ with tab3:
         ri_super_return = st.slider("Super Return Rate During Retirement (%)", min_value=1.0, max_value=20.0, value=4.0, step=0.1) / 100
         ri_target_income = st.number_input(target_income_label, min_value=0, value=60000 if ri_relationship_status == 'single' else 90000, step=1000)
 
+    ri_inputs = (ri_start_super, ri_start_age, ri_end_age, ri_super_return, ri_target_income, ri_relationship_status)
     if st.button("Run Retirement Projection"):
         if ri_start_age >= ri_end_age:
             st.error("Retirement start age must be less than the end age.")
         else:
-            projection_results = sp.project_retirement_income(ri_start_super, ri_start_age, ri_end_age, ri_super_return, ri_target_income, ri_relationship_status)
-            
-            if not projection_results:
-                st.warning("No projection could be generated with the given inputs. Please check your values.")
-            else:
-                df_results = pd.DataFrame(projection_results)
-                
-                st.subheader("Year-by-Year Projection")
-                st.dataframe(df_results.style.format({
-                    "Start Super ($)": "${:,.2f}",
-                    "Min Drawdown ($)": "${:,.2f}",
-                    "Annual Super Withdrawal ($)": "${:,.2f}",
-                    "Annual Age Pension ($)": "${:,.2f}",
-                    "Total Annual Income (Pre-Tax) ($)": "${:,.2f}",
-                    "Taxable Income ($)": "${:,.2f}", # For couples, this is the per-person taxable portion of AP
-                    "Tax Payment ($)": "${:,.2f}", # This is the total tax paid by the household
-                    "Total Income (After Tax) ($)": "${:,.2f}",
-                    "Investment Return ($)": "${:,.2f}",
-                    "End Super ($)": "${:,.2f}"
-                }))
-
-                st.subheader("Summary")
-                last_year_data = df_results.iloc[-1]
-                
-                status_text = "your" if ri_relationship_status == 'single' else "your combined"
-                income_status_text = "your" if ri_relationship_status == 'single' else "the household's"
-                
-                st.write(f"Projection runs from **Age {ri_start_age}** to **Age {last_year_data['Age']}** (for {status_text} eldest partner if couple).")
-                
-                if last_year_data["End Super ($)"] <= 0:
-                    st.warning(f"**{status_text.capitalize()} super balance was depleted at Age {last_year_data['Age']}**.")
-                    if last_year_data["Annual Age Pension ($)"] > 0:
-                        st.info(f"From that point onwards, {income_status_text} annual income (if any) would rely solely on the Age Pension, which was **${last_year_data['Annual Age Pension ($)'] :,.2f}** (pre-tax) / **${last_year_data['Total Income (After Tax) ($)'] :,.2f}** (after-tax) at Age {last_year_data['Age']}.")
-                        if last_year_data['Total Income (After Tax) ($)'] < ri_target_income:
-                             st.error(f"Note: Desired after-tax income of ${ri_target_income:,.2f} was not consistently met after super depletion.")
-                    else:
-                        st.error(f"{status_text.capitalize()} super balance depleted and no Age Pension was received at Age {last_year_data['Age']}. Income would likely cease.")
+            st.session_state.ri_result = (ri_inputs, project_retirement_income(*ri_inputs))
+
+    df_results = last_result("ri_result", ri_inputs)
+    if df_results is not None:
+        if df_results.empty:
+            st.warning("No projection could be generated with the given inputs. Please check your values.")
+        else:
+            st.subheader("Year-by-Year Projection")
+            # Format currency columns client-side rather than through a per-cell Styler
+            currency_format = st.column_config.NumberColumn(format="dollar")
+            st.dataframe(df_results, column_config={
+                "Start Super ($)": currency_format,
+                "Min Drawdown ($)": currency_format,
+                "Annual Super Withdrawal ($)": currency_format,
+                "Annual Age Pension ($)": currency_format,
+                "Total Annual Income (Pre-Tax) ($)": currency_format,
+                "Taxable Income ($)": currency_format, # For couples, this is the per-person taxable portion of AP
+                "Tax Payment ($)": currency_format, # This is the total tax paid by the household
+                "Total Income (After Tax) ($)": currency_format,
+                "Investment Return ($)": currency_format,
+                "End Super ($)": currency_format
+            })
+
+            st.subheader("Summary")
+            last_year_data = df_results.iloc[-1]
+
+            status_text = "your" if ri_relationship_status == 'single' else "your combined"
+            income_status_text = "your" if ri_relationship_status == 'single' else "the household's"
+
+            st.write(f"Projection runs from **Age {ri_start_age}** to **Age {last_year_data['Age']}** (for {status_text} eldest partner if couple).")
+
+            if last_year_data["End Super ($)"] <= 0:
+                st.warning(f"**{status_text.capitalize()} super balance was depleted at Age {last_year_data['Age']}**.")
+                if last_year_data["Annual Age Pension ($)"] > 0:
+                    st.info(f"From that point onwards, {income_status_text} annual income (if any) would rely solely on the Age Pension, which was **${last_year_data['Annual Age Pension ($)'] :,.2f}** (pre-tax) / **${last_year_data['Total Income (After Tax) ($)'] :,.2f}** (after-tax) at Age {last_year_data['Age']}.")
+                    if last_year_data['Total Income (After Tax) ($)'] < ri_target_income:
+                         st.error(f"Note: Desired after-tax income of ${ri_target_income:,.2f} was not consistently met after super depletion.")
                 else:
-                    st.success(f"At **Age {last_year_data['Age']}**, {status_text} projected super balance remaining is **${last_year_data['End Super ($)']:,.2f}**.")
-                    st.info(f"{income_status_text.capitalize()} consistently achieved an after-tax income of at least **${ri_target_income:,.2f}** per year.")
+                    st.error(f"{status_text.capitalize()} super balance depleted and no Age Pension was received at Age {last_year_data['Age']}. Income would likely cease.")
+            else:
+                st.success(f"At **Age {last_year_data['Age']}**, {status_text} projected super balance remaining is **${last_year_data['End Super ($)']:,.2f}**.")
+                st.info(f"{income_status_text.capitalize()} consistently achieved an after-tax income of at least **${ri_target_income:,.2f}** per year.")
+
+with tab4:
+    st.header("Sensitivity Analysis")
+    st.write("See how the super balance left at the end of retirement changes across a range of return rates and desired incomes.")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        sa_relationship_status = st.radio("Are you single or a couple? ", ('single', 'couple'))
+        sa_start_super = st.number_input("Super Balance at Retirement Start ($)", min_value=0, value=800000 if sa_relationship_status == 'single' else 1400000, step=10000)
+        sa_start_age = st.number_input("Age at Retirement Start (for eldest partner if couple) ", min_value=60, max_value=75, value=65, step=1)
+        sa_end_age = st.number_input("Project Until Age ", min_value=80, max_value=100, value=100, step=1)
+
+    with col2:
+        sa_return_range = st.slider("Super Return Rate Range (%)", min_value=1.0, max_value=20.0, value=(2.0, 8.0), step=0.5)
+        sa_target_range = st.slider("Desired Annual After-Tax Income Range ($)", min_value=0, max_value=200000, value=(40000, 100000), step=5000)
+
+    sa_return_rates = tuple(rate / 1000 for rate in range(round(sa_return_range[0] * 10), round(sa_return_range[1] * 10) + 1, 5))
+    sa_target_incomes = tuple(range(sa_target_range[0], sa_target_range[1] + 1, 5000))
+    sa_inputs = (sa_start_super, sa_start_age, sa_end_age, sa_return_rates, sa_target_incomes, sa_relationship_status)
+    if st.button("Run Sensitivity Analysis"):
+        if sa_start_age >= sa_end_age:
+            st.error("Retirement start age must be less than the end age.")
+        else:
+            st.session_state.sa_result = (sa_inputs, project_grid(*sa_inputs))
+
+    grid = last_result("sa_result", sa_inputs)
+    if grid is not None:
+        # A projection that stopped early has depleted its super, so its missing final years count as $0
+        end_super = np.nan_to_num(grid[:, :, sp.PROJECTION_COLUMNS.index("End Super ($)"), -1])
+        return_grid, target_grid = np.meshgrid(sa_return_rates, sa_target_incomes, indexing='ij')
+        df_grid = pd.DataFrame({
+            "Return Rate (%)": np.round(return_grid.ravel() * 100, 1),
+            "Desired After-Tax Income ($)": target_grid.ravel(),
+            "Final Super ($)": np.round(end_super.ravel()) # The grid is float32, so whole dollars only
+        })
+
+        st.subheader(f"Super Balance Remaining at Age {sa_end_age}")
+        st.altair_chart(alt.Chart(df_grid).mark_rect().encode(
+            x=alt.X("Desired After-Tax Income ($):O"),
+            y=alt.Y("Return Rate (%):O", sort="descending"),
+            color=alt.Color("Final Super ($):Q"),
+            tooltip=["Return Rate (%)", alt.Tooltip("Desired After-Tax Income ($)", format="$,.0f"), alt.Tooltip("Final Super ($)", format="$,.0f")]
+        ))
 
 st.markdown("---")
 st.markdown("Disclaimer: This tool is for illustrative purposes only and provides general information. "